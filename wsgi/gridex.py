@@ -6,133 +6,273 @@ It also enables querying of the index file to find GeoTIFF files that overlap wi
 
 Functions:
 
-- create_index(directory):
-    Scans a specified directory for .tif files, extracts their bounding boxes and spatial reference (SRID),
-    and writes this information to an index file (_index.csv) in the same directory.
+- create_index(directory, executor=None):
+    Scans a specified directory for .tif files, extracts their bounding boxes and spatial reference (SRID)
+    in parallel, and writes this information to an index file (_index.csv) in the same directory.
 
-- get_epsg_code(dataset):
-    Extracts the EPSG code (SRID) from a GeoTIFF dataset's projection information. Returns 'Unknown' if
-    the SRID cannot be determined.
+- extract_index_entry(tif_entry):
+    Extracts the index entry of a single .tif file: its name, size, bounding box in the original CRS, SRID,
+    and bounding polygon and bounding box in EPSG:4326.
+
+- get_projection_info(projection):
+    Returns the EPSG code of a projection and a coordinate transformation from it to EPSG:4326, both
+    cached by projection.
+
+- read_raster_metadata(file_path):
+    Reads the geotransform, raster size, and projection of a .tif file from its header. Returns None if
+    the file cannot be opened.
+
+- get_epsg_code(projection):
+    Extracts the EPSG code (SRID) from a GeoTIFF file's projection WKT and memoizes it by projection.
+    Returns 'Unknown' if the SRID cannot be determined.
 
 - query_index(directory, query_geometry):
     Reads the index file in a directory and returns a list of .tif files whose bounding boxes intersect
-    with a provided query geometry in GeoJSON format.
+    with a provided query geometry. Bounding boxes are compared first and only the geometries of the remaining
+    candidates are parsed and tested.
+
+- load_index(index_path, mtime):
+    Loads an index file into NumPy columns, with the bounding boxes sorted by their minimum X. The result
+    is cached until the modification time of the index file changes, and the geometries of the files are
+    parsed lazily and cached along with it.
 
 - mbr_overlap(polygon_mbr, file_mbr):
     Checks if two bounding boxes (MBRs) overlap by comparing their minimum and maximum X/Y coordinates.
+    Accepts NumPy arrays to check many bounding boxes at once.
 
 - index_directories_recursively(root_directory):
     Recursively searches through all subdirectories under the root directory for .tif files, and creates
-    an index file in each directory that contains at least one .tif file. Skips directories that already
-    have an _index.csv file.
+    an index file in each directory that contains at least one .tif file. All directories share one thread
+    pool for their files. Skips directories that already have an up-to-date _index.csv file and rebuilds
+    outdated ones.
+
+- is_index_current(index_path):
+    Checks whether an index file has the current header. Older indexes are rebuilt by
+    index_directories_recursively.
 
 - main():
-    The entry point of the script. Takes a directory path as a command-line argument and recursively
-    indexes all directories under the given path that contain .tif files.
+    The entry point of the script. Takes a directory path as a command-line argument, applies the GDAL
+    configuration in INDEXING_CONFIG_OPTIONS, and recursively indexes all directories under the given path
+    that contain .tif files.
 """
 
 
 import os
 import sys
 import csv
+import mmap
+import contextlib
+import functools
+import threading
+import concurrent.futures
+from collections import namedtuple
+import numpy as np
 from osgeo import gdal, osr, ogr
 import shapely
 
 INDEX_FILE = "_index.csv"
 
-# Enable GDAL exceptions for better error handling
-gdal.UseExceptions()
-
-def create_index(directory):
-    """
-    Scans a directory for .tif files, extracts their bounding box information (MBR),
-    and creates an index file (_index.csv) in the directory.
+# x1, y1, x2, y2 is the bounding box in the CRS of the file and x1_4326, y1_4326, x2_4326, y2_4326
+# is the bounding box of Geometry4326. Indexes created before the last four columns were added are still supported.
+INDEX_HEADER = ["ID", "FileName", "FileSize", "x1", "y1", "x2", "y2", "SRID", "Geometry4326",
+                "x1_4326", "y1_4326", "x2_4326", "y2_4326"]
 
-    The index will have columns: ID, FileName, FileSize, x1, y1, x2, y2, SRID, Geometry4326.
+# Positions of the columns of INDEX_HEADER read by queries
+COL_FILE_NAME = 1
+COL_GEOMETRY_4326 = 8
+COL_X1_4326 = 9
+COL_Y1_4326 = 10
+COL_X2_4326 = 11
+COL_Y2_4326 = 12
 
-    :param directory: The directory containing the .tif files to index.
-    """
-    index_path = os.path.join(directory, INDEX_FILE)
+# An index file loaded in memory with one array per column. The bounding box x1, y1, x2, y2 is in EPSG:4326 and
+# sorted by x1; order maps its positions back to rows of the index, which the other columns follow
+IndexData = namedtuple("IndexData", ["file_names", "file_wkts", "x1", "y1", "x2", "y2", "order", "geometries"])
 
-    # Open the index file for writing
-    with open(index_path, mode='w', newline='') as index_file:
-        writer = csv.writer(index_file, delimiter=';')
+# Per-thread state used while indexing
+_thread_local = threading.local()
 
-        # Write header: ID, FileName, FileSize, x1, y1, x2, y2, SRID, Geometry4326
-        writer.writerow(["ID", "FileName", "FileSize", "x1", "y1", "x2", "y2", "SRID", "Geometry4326"])
+# EPSG codes by projection WKT. The files of a dataset share a handful of projections, so this stays small
+_epsg_cache = {}
 
-        file_id = 0
+# Enable GDAL exceptions for better error handling
+gdal.UseExceptions()
 
-        # Iterate through all .tif files in the directory
-        for filename in os.listdir(directory):
-            if filename.endswith(".tif"):
-                file_path = os.path.join(directory, filename)
+# Number of threads used to extract the metadata of the files in one directory
+INDEXING_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-                # Open the TIFF file and extract its bounding box (MBR)
-                dataset = gdal.Open(file_path)
-                if dataset:
-                    geo_transform = dataset.GetGeoTransform()
-                    width = dataset.RasterXSize
-                    height = dataset.RasterYSize
+# GDAL configuration used while indexing. Indexed GeoTIFFs carry their georeferencing in the file itself, so GDAL
+# does not need to list the directory and probe for sidecar files (.aux.xml, .tfw, .ovr, .msk) on every open.
+# These are applied by main() rather than at import time since the web server imports this module too.
+INDEXING_CONFIG_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_CACHEMAX": "512",
+    "GDAL_NUM_THREADS": "ALL_CPUS",
+    "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif",
+}
 
-                    # Calculate the bounding box in the original CRS
-                    min_x = geo_transform[0]
-                    max_x = min_x + width * geo_transform[1]
-                    min_y = geo_transform[3] + height * geo_transform[5]
-                    max_y = geo_transform[3]
+def create_index(directory, executor=None):
+    """
+    Scans a directory for .tif files, extracts their bounding box information (MBR),
+    and creates an index file (_index.csv) in the directory. Files are processed in parallel
+    since extracting the metadata of each file is independent and dominated by I/O.
 
-                    # Get the file size
-                    file_size = os.path.getsize(file_path)
+    The index will have columns: ID, FileName, FileSize, x1, y1, x2, y2, SRID, Geometry4326,
+    x1_4326, y1_4326, x2_4326, y2_4326.
 
-                    # Extract the SRID (EPSG code) from the dataset's projection
-                    srid = get_epsg_code(dataset)
+    :param directory: The directory containing the .tif files to index.
+    :param executor: An optional executor to extract the entries with. If not given, a thread pool of
+                     INDEXING_WORKERS threads is created for this directory.
+    """
+    index_path = os.path.join(directory, INDEX_FILE)
+    with os.scandir(directory) as entries:
+        tif_entries = [entry for entry in entries if entry.name.endswith(".tif") and entry.is_file()]
+
+    # Extract the entries in parallel, keeping the order of the files
+    if executor is None:
+        executor_context = concurrent.futures.ThreadPoolExecutor(max_workers=INDEXING_WORKERS)
+    else:
+        executor_context = contextlib.nullcontext(executor)
+    with executor_context as executor:
+        index_entries = [entry for entry in executor.map(extract_index_entry, tif_entries) if entry]
+
+    # Write the whole index at once through a large buffer. It is written to a temporary file first and
+    # then moved into place, so server processes never load a partially written index
+    temp_index_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_index_path, mode='w', newline='', buffering=1 << 20) as index_file:
+            writer = csv.writer(index_file, delimiter=';')
+            writer.writerow(INDEX_HEADER)
+            writer.writerows([file_id] + entry for file_id, entry in enumerate(index_entries))
+        os.replace(temp_index_path, index_path)
+    except BaseException:
+        # Do not leave a partial temporary file in the data directory
+        if os.path.exists(temp_index_path):
+            os.remove(temp_index_path)
+        raise
 
-                    # Transform the bounding box to EPSG:4326 for Geometry4326
-                    source_srs = osr.SpatialReference()
-                    source_srs.ImportFromWkt(dataset.GetProjection())
+    print(f"Index created at {index_path}")
 
-                    target_srs = osr.SpatialReference()
-                    target_srs.ImportFromEPSG(4326)
-                    target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+def extract_index_entry(tif_entry):
+    """
+    Extracts the index entry of a single .tif file.
 
-                    transform = osr.CoordinateTransformation(source_srs, target_srs)
+    :param tif_entry: The os.DirEntry of the .tif file.
+    :return: A list [FileName, FileSize, x1, y1, x2, y2, SRID, Geometry4326, x1_4326, y1_4326, x2_4326, y2_4326]
+             or None if the file cannot be read.
+    """
+    # Read the TIFF header and extract its bounding box (MBR)
+    metadata = read_raster_metadata(tif_entry.path)
+    if not metadata:
+        return None
+    geo_transform, width, height, projection = metadata
+
+    # Calculate the bounding box in the original CRS
+    min_x = geo_transform[0]
+    max_x = min_x + width * geo_transform[1]
+    min_y = geo_transform[3] + height * geo_transform[5]
+    max_y = geo_transform[3]
+
+    # Get the file size
+    file_size = tif_entry.stat().st_size
+
+    # Look up the SRID (EPSG code) and the transformation to EPSG:4326 of the dataset's projection
+    srid, transform = get_projection_info(projection)
+
+    # Transform corners of the bounding box to EPSG:4326
+    ll = transform.TransformPoint(min_x, min_y)  # Lower-left
+    lr = transform.TransformPoint(max_x, min_y)  # Lower-right
+    ur = transform.TransformPoint(max_x, max_y)  # Upper-right
+    ul = transform.TransformPoint(min_x, max_y)  # Upper-left
+
+    # Ensure the WKT geometry is in (longitude, latitude) order
+    wkt_polygon = (
+        f"POLYGON (({ll[0]} {ll[1]}, {lr[0]} {lr[1]}, "
+        f"{ur[0]} {ur[1]}, {ul[0]} {ul[1]}, {ll[0]} {ll[1]}))"
+    )
+
+    # The bounding box of the transformed corners lets queries filter files without parsing the WKT
+    lons = (ll[0], lr[0], ur[0], ul[0])
+    lats = (ll[1], lr[1], ur[1], ul[1])
+
+    return [tif_entry.name, file_size, min_x, min_y, max_x, max_y, srid, wkt_polygon,
+            min(lons), min(lats), max(lons), max(lats)]
+
+def get_projection_info(projection):
+    """
+    Returns the EPSG code of a projection and a coordinate transformation from it to EPSG:4326 in
+    (longitude, latitude) order. Both are cached by projection since the files of a directory usually
+    share the same one, so a single lookup serves all of them. OSR transformations are not thread-safe,
+    so each thread keeps its own cache.
 
-                    # Transform corners of the bounding box to EPSG:4326
-                    ll = transform.TransformPoint(min_x, min_y)  # Lower-left
-                    lr = transform.TransformPoint(max_x, min_y)  # Lower-right
-                    ur = transform.TransformPoint(max_x, max_y)  # Upper-right
-                    ul = transform.TransformPoint(min_x, max_y)  # Upper-left
+    :param projection: The source projection in WKT format.
+    :return: A tuple (srid, transform) of the EPSG code, or 'Unknown', and an osr.CoordinateTransformation.
+    """
+    if not hasattr(_thread_local, "projections"):
+        _thread_local.projections = {}
 
-                    # Ensure the WKT geometry is in (longitude, latitude) order
-                    wkt_polygon = (
-                        f"POLYGON (({ll[0]} {ll[1]}, {lr[0]} {lr[1]}, "
-                        f"{ur[0]} {ur[1]}, {ul[0]} {ul[1]}, {ll[0]} {ll[1]}))"
-                    )
+    projection_info = _thread_local.projections.get(projection)
+    if projection_info is None:
+        source_srs = osr.SpatialReference()
+        source_srs.ImportFromWkt(projection)
+        # Geotransform coordinates are always in (x, y) order, even for CRSs that define (latitude, longitude)
+        source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
 
-                    # Write the file information and its bounding box to the index file
-                    writer.writerow([file_id, filename, file_size, min_x, min_y, max_x, max_y, srid, wkt_polygon])
+        target_srs = osr.SpatialReference()
+        target_srs.ImportFromEPSG(4326)
+        target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
 
-                    # Increment the file ID
-                    file_id += 1
+        transform = osr.CoordinateTransformation(source_srs, target_srs)
+        projection_info = (get_epsg_code(projection), transform)
+        _thread_local.projections[projection] = projection_info
 
-                    # Close the dataset
-                    dataset = None
+    return projection_info
 
-    print(f"Index created at {index_path}")
+def read_raster_metadata(file_path):
+    """
+    Reads the geotransform, raster size, and projection of a GeoTIFF file. Only the header is read; no pixel
+    data is accessed. The file is opened with the GTiff driver only, so GDAL does not probe every registered
+    driver to identify it, and any other driver is tried as a fallback.
 
-def get_epsg_code(dataset):
+    :param file_path: The path to the .tif file.
+    :return: A tuple (geo_transform, width, height, projection) or None if the file cannot be read.
     """
-    Extract the EPSG code (SRID) from the GeoTIFF dataset's projection.
+    try:
+        dataset = gdal.OpenEx(file_path, gdal.OF_RASTER | gdal.OF_READONLY, allowed_drivers=["GTiff"])
+    except RuntimeError:
+        try:
+            dataset = gdal.OpenEx(file_path, gdal.OF_RASTER | gdal.OF_READONLY)
+        except RuntimeError:
+            return None
+    if not dataset:
+        return None
+
+    return dataset.GetGeoTransform(), dataset.RasterXSize, dataset.RasterYSize, dataset.GetProjectionRef()
+
+def get_epsg_code(projection):
+    """
+    Extract the EPSG code (SRID) from the projection of a GeoTIFF file.
 
-    :param dataset: The GDAL dataset of the GeoTIFF file.
+    :param projection: The projection of the GeoTIFF file in WKT format.
     :return: The EPSG code (SRID) or 'Unknown' if it cannot be determined.
     """
-    projection = dataset.GetProjection()
     if not projection:
         return "Unknown"
 
+    epsg_code = _epsg_cache.get(projection)
+    if epsg_code is None:
+        epsg_code = _epsg_cache[projection] = _epsg_from_wkt(projection)
+    return epsg_code
+
+def _epsg_from_wkt(wkt):
+    """
+    Parses a projection WKT and looks up its EPSG code.
+
+    :param wkt: The projection in WKT format.
+    :return: The EPSG code (SRID) or 'Unknown' if it cannot be determined.
+    """
     # Use the SpatialReference object to extract the EPSG code
-    spatial_ref = osr.SpatialReference(wkt=projection)
+    spatial_ref = osr.SpatialReference(wkt=wkt)
     if spatial_ref.IsProjected() or spatial_ref.IsGeographic():
         epsg_code = spatial_ref.GetAttrValue("AUTHORITY", 1)
         if epsg_code:
@@ -147,7 +287,7 @@ def query_index(directory, query_geom):
     does not exist, returns all .tif files in the directory.
 
     :param directory: The directory containing the index file and .tif files.
-    :param query_geom: The query geometry (GeoJSON format).
+    :param query_geom: The query geometry as a Shapely geometry in EPSG:4326.
     :return: A list of .tif file names that overlap with the query geometry, or all .tif files if the index file is missing.
     """
     index_path = os.path.join(directory, INDEX_FILE)
@@ -155,63 +295,164 @@ def query_index(directory, query_geom):
 
     if not os.path.exists(index_path):
         # If the index file does not exist, return all .tif files in the directory
-        for filename in os.listdir(directory):
-            if filename.endswith(".tif"):
-                overlapping_files.append(filename)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tif") and entry.is_file():
+                    overlapping_files.append(entry.name)
         return overlapping_files
 
-    # Open the index file and read the geometries
-    with open(index_path, mode='r') as index_file:
-        reader = csv.DictReader(index_file, delimiter=';')
+    # MBR of the query geometry
+    q_min_x, q_min_y, q_max_x, q_max_y = query_geom.bounds
 
-        for row in reader:
-            # Get the WKT geometry for the file from the index
-            file_geometry_wkt = row["Geometry4326"]
+    # Load the index, or reuse it if it was already loaded and has not been modified since
+    index = load_index(index_path, os.path.getmtime(index_path))
 
-            # Convert the WKT geometry into an OGR geometry object
-            from shapely.wkt import loads as wkt_loads
-            file_geom = wkt_loads(file_geometry_wkt)
+    # Filter step: skip files whose bounding box does not overlap the query MBR before parsing their geometry.
+    # Since the boxes are sorted by x1, only the leading ones that start before q_max_x need to be compared
+    n = np.searchsorted(index.x1, q_max_x, side="right")
+    file_mbrs = (index.x1[:n], index.x2[:n], index.y1[:n], index.y2[:n])
+    overlaps = mbr_overlap((q_min_x, q_max_x, q_min_y, q_max_y), file_mbrs)
+    candidates = np.sort(index.order[:n][overlaps])
+    if candidates.size == 0:
+        return overlapping_files
+
+    # Refinement step: parse the geometries of the candidates that were not parsed by an earlier query
+    # and test them against the query geometry
+    unparsed = candidates[shapely.is_missing(index.geometries[candidates])]
+    index.geometries[unparsed] = shapely.from_wkt(index.file_wkts[unparsed])
 
-            # Check if the query geometry intersects with the file's geometry
-            if query_geom.intersects(file_geom):
-                overlapping_files.append(row["FileName"])
+    # Test the candidates against a prepared copy of the query geometry so GEOS builds its internal index once
+    # for all of them. The caller's geometry is not prepared in place since callers share it across threads
+    prepared_query_geom = shapely.from_wkb(shapely.to_wkb(query_geom))
+    shapely.prepare(prepared_query_geom)
+    matches = shapely.intersects(prepared_query_geom, index.geometries[candidates])
+    overlapping_files.extend(index.file_names[candidates[matches]])
 
     return overlapping_files
 
+@functools.lru_cache(maxsize=64)
+def load_index(index_path, mtime):
+    """
+    Loads an index file column-wise so that all bounding boxes can be compared in a single vectorized pass.
+    The result is cached and reused by later queries as long as the modification time of the file is the same.
+
+    :param index_path: The path to the index file (_index.csv).
+    :param mtime: The modification time of the index file. Only used as part of the cache key.
+    :return: An IndexData tuple. Its geometries array starts empty and is filled in by query_index
+             as the geometries of the files are parsed.
+    """
+    # Rows are split directly from a memory map of the file and addressed by column position. The fields are
+    # kept as bytes, so the WKT of a file is only decoded if a query needs its geometry
+    header = []
+    rows = []
+    with open(index_path, mode='rb') as index_file:
+        if os.fstat(index_file.fileno()).st_size > 0:
+            with mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index_map:
+                header = index_map.readline().rstrip(b"\r\n").split(b";")
+                for line in iter(index_map.readline, b""):
+                    line = line.rstrip(b"\r\n")
+                    if b'"' in line:
+                        # Quoted fields, e.g., a file name that contains a semicolon, need the CSV parser
+                        row = next(csv.reader([line.decode()], delimiter=';'))
+                        rows.append([field.encode() for field in row])
+                    elif line:
+                        rows.append(line.split(b";"))
+
+    file_wkts = np.array([row[COL_GEOMETRY_4326] for row in rows], dtype=object)
+    geometries = np.full(len(rows), None, dtype=object)
+
+    if rows and len(header) > COL_Y2_4326:
+        bounds = np.array([row[COL_X1_4326:COL_Y2_4326 + 1] for row in rows], dtype=np.float64)
+    else:
+        # Older indexes do not store the bounding box in EPSG:4326, so compute it from the geometries
+        geometries[:] = shapely.from_wkt(file_wkts)
+        bounds = shapely.bounds(geometries)
+
+    # Sort the bounding boxes by x1 so that a query can skip all the boxes that start to its right
+    order = np.argsort(bounds[:, 0], kind="stable")
+    bounds = bounds[order]
+
+    return IndexData(
+        file_names=np.array([row[COL_FILE_NAME].decode() for row in rows], dtype=object),
+        file_wkts=file_wkts,
+        x1=np.ascontiguousarray(bounds[:, 0]),
+        y1=np.ascontiguousarray(bounds[:, 1]),
+        x2=np.ascontiguousarray(bounds[:, 2]),
+        y2=np.ascontiguousarray(bounds[:, 3]),
+        order=order,
+        geometries=geometries,
+    )
+
 def mbr_overlap(polygon_mbr, file_mbr):
     """
-    Checks if two bounding boxes (MBRs) overlap.
+    Checks if two bounding boxes (MBRs) overlap. The coordinates of file_mbr can be NumPy arrays
+    to check the bounding boxes of many files in one vectorized operation.
 
     :param polygon_mbr: The bounding box of the query geometry (minX, maxX, minY, maxY).
-    :param file_mbr: The bounding box of a .tif file (minX, maxX, minY, maxY).
-    :return: True if the bounding boxes overlap, False otherwise.
+    :param file_mbr: The bounding box of a .tif file (minX, maxX, minY, maxY), or four arrays of coordinates.
+    :return: True if the bounding boxes overlap, False otherwise, or a boolean array with one value per file.
     """
     p_min_x, p_max_x, p_min_y, p_max_y = polygon_mbr
     f_min_x, f_max_x, f_min_y, f_max_y = file_mbr
 
     # Check for overlap
-    return not (p_max_x < f_min_x or p_min_x > f_max_x or p_max_y < f_min_y or p_min_y > f_max_y)
+    return np.logical_not((p_max_x < f_min_x) | (p_min_x > f_max_x) | (p_max_y < f_min_y) | (p_min_y > f_max_y))
+
+def is_index_current(index_path):
+    """
+    Checks whether an index file was created with the current layout of the index. Indexes created before the
+    EPSG:4326 bounding box columns were added may also have swapped (latitude, longitude) coordinates in
+    Geometry4326 for files in EPSG:4326, so they need to be rebuilt.
+
+    :param index_path: The path to the index file (_index.csv).
+    :return: True if the header of the index file matches INDEX_HEADER, False otherwise.
+    """
+    with open(index_path, mode='r', newline='') as index_file:
+        header = next(csv.reader(index_file, delimiter=';'), [])
+    return header == INDEX_HEADER
 
 def index_directories_recursively(root_directory):
     """
     Recursively index all directories that contain at least one .tif file under the root_directory.
-    If a directory already contains an _index.csv file, skip creating a new one.
+    If a directory already contains an up-to-date _index.csv file, skip creating a new one.
 
     :param root_directory: The root directory to start searching for .tif files.
     """
-    for dirpath, _, filenames in os.walk(root_directory):
-        # Check if there are any .tif files in the directory
-        tif_files = [f for f in filenames if f.endswith('.tif')]
-
-        if tif_files:
-            index_path = os.path.join(dirpath, INDEX_FILE)
-
-            # If the index file already exists, skip this directory
+    directories_to_index = []
+    pending_directories = [root_directory]
+    while pending_directories:
+        dirpath = pending_directories.pop()
+
+        # Check for an existing index first so that an indexed directory is only listed for its subdirectories.
+        # Outdated indexes are rebuilt
+        index_path = os.path.join(dirpath, INDEX_FILE)
+        already_indexed = os.path.exists(index_path) and is_index_current(index_path)
+
+        # List the directory once to find both its .tif files and its subdirectories
+        has_tif_files = False
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_directories.append(entry.path)
+                    elif not already_indexed and not has_tif_files and entry.name.endswith('.tif'):
+                        has_tif_files = True
+        except OSError:
+            # Skip directories that cannot be listed, as os.walk does
+            continue
+
+        if already_indexed:
+            print(f"Index file already exists in {dirpath}. Skipping.")
+        elif has_tif_files:
             if os.path.exists(index_path):
-                print(f"Index file already exists in {dirpath}. Skipping.")
-            else:
-                print(f"Creating index for {dirpath}...")
-                create_index(dirpath)
+                print(f"Index file in {dirpath} is outdated. Rebuilding.")
+            directories_to_index.append(dirpath)
+
+    # Index the directories one at a time, sharing a single thread pool for the files of all of them
+    # so that the number of files open at once stays bounded by INDEXING_WORKERS
+    with concurrent.futures.ThreadPoolExecutor(max_workers=INDEXING_WORKERS) as executor:
+        for dirpath in directories_to_index:
+            create_index(dirpath, executor)
 
 def main():
     """
@@ -228,6 +469,9 @@ def main():
         print(f"Error: {root_directory} is not a valid directory")
         sys.exit(1)
 
+    for key, value in INDEXING_CONFIG_OPTIONS.items():
+        gdal.SetConfigOption(key, value)
+
     # Recursively index directories containing .tif files
     index_directories_recursively(root_directory)
 